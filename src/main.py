@@ -6,6 +6,7 @@ Marine Cadastre AIS Data Processor
 This script processes AIS vessel data from Marine Cadastre into GeoJSON format for Mapbox visualization.
 """
 
+import logging
 import os
 import click
 from pathlib import Path
@@ -20,7 +21,9 @@ from processors.tile_generator import (
 @click.group()
 def cli():
     """Process Marine Cadastre AIS data into Mapbox-compatible formats."""
-    pass
+    # The processors log per-file skip/warning diagnostics at INFO level;
+    # without a configured handler only WARNING and above would surface
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 
 @cli.command()
@@ -32,10 +35,42 @@ def cli():
     help="Field containing timestamp information",
 )
 @click.option("--force", is_flag=True, help="Force reprocessing of existing files")
-def process_counts(input_path, output_path, time_field, force):
+@click.option(
+    "--partition-by",
+    type=click.Choice(["day", "month"]),
+    default="day",
+    help="Time bucket for output files (month coalesces small daily files)",
+)
+@click.option(
+    "--use-flatgeobuf",
+    is_flag=True,
+    help="Write FlatGeobuf (.fgb) instead of GeoJSON (faster for tippecanoe)",
+)
+@click.option(
+    "--newline-delimited",
+    is_flag=True,
+    help="Write newline-delimited GeoJSON (.geojsonl) instead of FeatureCollections",
+)
+def process_counts(
+    input_path,
+    output_path,
+    time_field,
+    force,
+    partition_by,
+    use_flatgeobuf,
+    newline_delimited,
+):
     """Process AISVesselTransitCounts data into time-series GeoJSON."""
     click.echo(f"Processing transit counts from {input_path} to {output_path}")
-    process_transit_counts(input_path, output_path, time_field, force_reprocess=force)
+    process_transit_counts(
+        input_path,
+        output_path,
+        time_field,
+        force_reprocess=force,
+        use_flatgeobuf=use_flatgeobuf,
+        newline_delimited=newline_delimited,
+        partition_by=partition_by,
+    )
 
 
 @cli.command()
@@ -45,10 +80,21 @@ def process_counts(input_path, output_path, time_field, force):
     "--time-field", default="TIMESTAMP", help="Field containing timestamp information"
 )
 @click.option("--force", is_flag=True, help="Force reprocessing of existing files")
-def process_tracks(input_path, output_path, time_field, force):
+@click.option(
+    "--newline-delimited",
+    is_flag=True,
+    help="Write newline-delimited GeoJSON (.geojsonl) instead of FeatureCollections",
+)
+def process_tracks(input_path, output_path, time_field, force, newline_delimited):
     """Process AISVesselTracks data into time-series GeoJSON."""
     click.echo(f"Processing vessel tracks from {input_path} to {output_path}")
-    process_vessel_tracks(input_path, output_path, time_field, force_reprocess=force)
+    process_vessel_tracks(
+        input_path,
+        output_path,
+        time_field,
+        force_reprocess=force,
+        newline_delimited=newline_delimited,
+    )
 
 
 @cli.command()
@@ -57,31 +103,57 @@ def process_tracks(input_path, output_path, time_field, force):
 @click.option("--min-zoom", default=0, type=int, help="Minimum zoom level")
 @click.option("--max-zoom", default=14, type=int, help="Maximum zoom level")
 @click.option("--force", is_flag=True, help="Force regeneration of existing tiles")
-def generate_tiles(input_path, output_path, min_zoom, max_zoom, force):
+@click.option(
+    "--jobs",
+    default=None,
+    type=int,
+    help="CPU budget for tile generation (default: CPU count)",
+)
+def generate_tiles(input_path, output_path, min_zoom, max_zoom, force, jobs):
     """Generate map tiles from GeoJSON or GeoTIFF data."""
     input_path = Path(input_path)
 
     if input_path.is_file():
         file_ext = input_path.suffix.lower()
-        if file_ext == ".geojson":
-            click.echo(f"Generating tiles from GeoJSON: {input_path}")
+        if file_ext in [".geojson", ".geojsonl", ".fgb"]:
+            click.echo(f"Generating tiles from vector data: {input_path}")
             generate_tiles_from_geojson(
-                input_path, output_path, min_zoom, max_zoom, force_regenerate=force
+                input_path,
+                output_path,
+                min_zoom,
+                max_zoom,
+                force_regenerate=force,
+                jobs=jobs,
             )
         elif file_ext in [".tif", ".tiff"]:
             click.echo(f"Generating tiles from GeoTIFF: {input_path}")
             generate_tiles_from_geotiff(
-                input_path, output_path, min_zoom, max_zoom, force_regenerate=force
+                input_path,
+                output_path,
+                min_zoom,
+                max_zoom,
+                force_regenerate=force,
+                jobs=jobs,
             )
         else:
             click.echo(f"Unsupported file format: {file_ext}")
     else:
-        # Check for GeoJSON files first
-        geojson_files = list(input_path.glob("*.geojson"))
+        # Check for vector files first; .geojsonl and .fgb are what the
+        # --newline-delimited and --use-flatgeobuf processing flags produce
+        geojson_files = (
+            list(input_path.glob("*.geojson"))
+            + list(input_path.glob("*.geojsonl"))
+            + list(input_path.glob("*.fgb"))
+        )
         if geojson_files:
-            click.echo(f"Generating tiles from {len(geojson_files)} GeoJSON files")
+            click.echo(f"Generating tiles from {len(geojson_files)} vector files")
             generate_tiles_from_geojson(
-                input_path, output_path, min_zoom, max_zoom, force_regenerate=force
+                input_path,
+                output_path,
+                min_zoom,
+                max_zoom,
+                force_regenerate=force,
+                jobs=jobs,
             )
 
         # Check for GeoTIFF files
@@ -89,7 +161,12 @@ def generate_tiles(input_path, output_path, min_zoom, max_zoom, force):
         if tif_files:
             click.echo(f"Generating tiles from {len(tif_files)} GeoTIFF files")
             generate_tiles_from_geotiff(
-                input_path, output_path, min_zoom, max_zoom, force_regenerate=force
+                input_path,
+                output_path,
+                min_zoom,
+                max_zoom,
+                force_regenerate=force,
+                jobs=jobs,
             )
 
         if not geojson_files and not tif_files:
@@ -112,7 +189,33 @@ def generate_tiles(input_path, output_path, min_zoom, max_zoom, force):
     default="auto",
     help="Type of data to process: counts, tracks, both, or auto-detect (default)",
 )
-def process_all(input_path, output_path, min_zoom, max_zoom, force, data_type):
+@click.option(
+    "--jobs",
+    default=None,
+    type=int,
+    help="CPU budget for tile generation (default: CPU count)",
+)
+@click.option(
+    "--use-flatgeobuf",
+    is_flag=True,
+    help="Write FlatGeobuf (.fgb) instead of GeoJSON (faster for tippecanoe)",
+)
+@click.option(
+    "--newline-delimited",
+    is_flag=True,
+    help="Write newline-delimited GeoJSON (.geojsonl) instead of FeatureCollections",
+)
+def process_all(
+    input_path,
+    output_path,
+    min_zoom,
+    max_zoom,
+    force,
+    data_type,
+    jobs,
+    use_flatgeobuf,
+    newline_delimited,
+):
     """Process data and generate tiles in one step."""
     input_path = Path(input_path)
     output_path = Path(output_path)
@@ -150,11 +253,22 @@ def process_all(input_path, output_path, min_zoom, max_zoom, force, data_type):
         # Process the data
         if process_counts_data:
             click.echo("Processing transit counts data...")
-            process_transit_counts(input_path, geojson_dir, force_reprocess=force)
+            process_transit_counts(
+                input_path,
+                geojson_dir,
+                force_reprocess=force,
+                use_flatgeobuf=use_flatgeobuf,
+                newline_delimited=newline_delimited,
+            )
 
         if process_tracks_data:
             click.echo("Processing vessel tracks data...")
-            process_vessel_tracks(input_path, geojson_dir, force_reprocess=force)
+            process_vessel_tracks(
+                input_path,
+                geojson_dir,
+                force_reprocess=force,
+                newline_delimited=newline_delimited,
+            )
 
     # Generate tiles from processed GeoJSON
     if geojson_dir.exists():
@@ -162,7 +276,7 @@ def process_all(input_path, output_path, min_zoom, max_zoom, force, data_type):
             f"Generating tiles from processed GeoJSON with zoom levels {min_zoom}-{max_zoom}..."
         )
         generate_tiles_from_geojson(
-            geojson_dir, tiles_dir, min_zoom, max_zoom, force_regenerate=force
+            geojson_dir, tiles_dir, min_zoom, max_zoom, force_regenerate=force, jobs=jobs
         )
 
     click.echo(f"Processing complete. Output saved to {output_path}")
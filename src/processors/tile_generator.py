@@ -8,13 +8,91 @@ Converts GeoJSON data into map tiles for efficient web visualization.
 
 import os
 import json
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from tqdm import tqdm
 
+# Tippecanoe and gdal2tiles each use several threads/processes of their own;
+# cap them so running multiple files concurrently doesn't oversubscribe cores
+TILER_THREADS_PER_JOB = 4
+
+
+def _run_streaming(cmd, env=None):
+    """Run a command, draining its stderr line-by-line instead of buffering.
+
+    Long tippecanoe/gdal2tiles runs emit megabytes of progress output;
+    capture_output would hold all of it in memory until the process exits.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        env=env,
+    )
+    for line in proc.stderr:
+        line = line.rstrip()
+        if line:
+            print(line)
+    proc.wait()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _default_max_workers(jobs):
+    """Number of concurrent tiler jobs that won't oversubscribe the budget."""
+    return max(1, jobs // TILER_THREADS_PER_JOB)
+
+
+@lru_cache(maxsize=1)
+def _have_tippecanoe():
+    """Check once whether tippecanoe is installed and on PATH."""
+    try:
+        subprocess.run(["tippecanoe", "--version"], check=True, capture_output=True)
+        return True
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _have_gdal():
+    """Check once whether the GDAL command-line tools are installed."""
+    try:
+        subprocess.run(["gdalinfo", "--version"], check=True, capture_output=True)
+        return True
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _tippecanoe_supports_flatgeobuf():
+    """Check whether this tippecanoe build can read FlatGeobuf input.
+
+    FlatGeobuf support arrived with the maintained v2 fork (felt/protomaps);
+    the original Mapbox releases stopped at v1.36 and only read GeoJSON.
+    """
+    try:
+        result = subprocess.run(
+            ["tippecanoe", "--version"], capture_output=True, text=True
+        )
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+    version_match = re.search(r"v(\d+)", result.stdout + result.stderr)
+    return version_match is not None and int(version_match.group(1)) >= 2
+
 
 def generate_tiles_from_geojson(
-    geojson_path, output_dir, min_zoom=0, max_zoom=14, force_regenerate=False
+    geojson_path,
+    output_dir,
+    min_zoom=0,
+    max_zoom=14,
+    force_regenerate=False,
+    max_workers=None,
+    jobs=None,
 ):
     """
     Generate map tiles from GeoJSON data using Tippecanoe.
@@ -25,15 +103,16 @@ def generate_tiles_from_geojson(
         min_zoom: Minimum zoom level (default: 0)
         max_zoom: Maximum zoom level (default: 14)
         force_regenerate: If True, regenerate tiles even if they already exist
+        max_workers: Number of tippecanoe jobs to run concurrently
+            (default: the jobs budget divided by tippecanoe's thread usage)
+        jobs: Total CPU budget for tile generation (default: CPU count)
     """
     geojson_path = Path(geojson_path)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Check if tippecanoe is installed
-    try:
-        subprocess.run(["tippecanoe", "--version"], check=True, capture_output=True)
-    except (subprocess.SubprocessError, FileNotFoundError):
+    if not _have_tippecanoe():
         print("Error: Tippecanoe is not installed or not in PATH.")
         print("Please install Tippecanoe: https://github.com/mapbox/tippecanoe")
         return False
@@ -43,83 +122,68 @@ def generate_tiles_from_geojson(
         files = [geojson_path]
     else:
         files = list(geojson_path.glob("*.geojson"))
+        # Newline-delimited GeoJSON, which tippecanoe ingests in parallel
+        files += list(geojson_path.glob("*.geojsonl"))
+        # FlatGeobuf inputs parse far faster than GeoJSON, but only newer
+        # tippecanoe builds can read them
+        fgb_files = list(geojson_path.glob("*.fgb"))
+        if fgb_files:
+            if _tippecanoe_supports_flatgeobuf():
+                files += fgb_files
+            else:
+                print(
+                    "Warning: this tippecanoe build cannot read FlatGeobuf; "
+                    f"skipping {len(fgb_files)} .fgb files"
+                )
 
-    # Track processed and skipped files
-    processed_files = 0
-    skipped_files = 0
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if max_workers is None:
+        max_workers = _default_max_workers(jobs)
 
-    for file in tqdm(files, desc="Generating tiles"):
-        try:
-            # Extract base name for the output
-            base_name = file.stem
-            mbtiles_output = output_dir / f"{base_name}.mbtiles"
-            extract_dir = output_dir / base_name
-
-            # Check if output already exists
-            if (
-                mbtiles_output.exists()
-                and extract_dir.exists()
-                and not force_regenerate
-            ):
+    # Drop inputs whose tiles already exist, using a single directory
+    # listing instead of per-file stat checks inside the loop
+    skipped_files = 0
+    if not force_regenerate:
+        existing = {p.name for p in output_dir.iterdir()}
+        remaining = []
+        for file in files:
+            if f"{file.stem}.mbtiles" in existing and file.stem in existing:
                 print(
-                    f"Skipping {file.name} - output already exists: {mbtiles_output} and {extract_dir}"
+                    f"Skipping {file.name} - output already exists: "
+                    f"{output_dir / (file.stem + '.mbtiles')} and {output_dir / file.stem}"
                 )
                 skipped_files += 1
-                continue
-
-            # Build tippecanoe command
-            cmd = [
-                "tippecanoe",
-                "-o",
-                str(mbtiles_output),
-                "-zg",  # Automatically determine zoom levels based on data
-                "--drop-densest-as-needed",  # Drop some features at high zoom levels if too dense
-                "--extend-zooms-if-still-dropping",  # Extend zoom levels if needed
-                "--force",  # Overwrite existing files
-                str(file),
-            ]
+            else:
+                remaining.append(file)
+        files = remaining
+
+    # A lone job may use the whole budget; concurrent jobs share it
+    serial = len(files) <= 1 or max_workers == 1
+    threads_per_job = jobs if serial else max(1, jobs // max_workers)
+
+    # The Python side only waits on subprocesses, so threads are enough to
+    # keep several tippecanoe jobs running at once
+    tile_one = partial(
+        _tile_one_geojson,
+        output_dir=output_dir,
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
+        threads=threads_per_job,
+    )
+    if serial:
+        results = [tile_one(file) for file in tqdm(files, desc="Generating tiles")]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                tqdm(
+                    executor.map(tile_one, files),
+                    total=len(files),
+                    desc="Generating tiles",
+                )
+            )
 
-            # Add zoom level constraints if specified
-            if min_zoom is not None:
-                cmd.extend(["-Z", str(min_zoom)])
-            if max_zoom is not None:
-                cmd.extend(["-z", str(max_zoom)])
-
-            # Run tippecanoe
-            print(f"Running: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-
-            # Extract tiles to directory if needed
-            if output_dir:
-                extract_dir.mkdir(parents=True, exist_ok=True)
-
-                # Use mb-util to extract tiles
-                extract_cmd = [
-                    "mb-util",
-                    "--image_format=pbf",
-                    str(mbtiles_output),
-                    str(extract_dir),
-                ]
-
-                try:
-                    print(f"Extracting tiles: {' '.join(extract_cmd)}")
-                    extract_result = subprocess.run(
-                        extract_cmd, check=True, capture_output=True, text=True
-                    )
-                except (subprocess.SubprocessError, FileNotFoundError):
-                    print(
-                        "Warning: mb-util not found. MBTiles file created but not extracted to directory structure."
-                    )
-                    print(
-                        "Install mb-util to extract tiles: npm install -g @mapbox/mbutil"
-                    )
-
-            print(f"Successfully generated tiles for {file}")
-            processed_files += 1
-
-        except Exception as e:
-            print(f"Error generating tiles for {file}: {str(e)}")
-            continue
+    processed_files = results.count("processed")
 
     print(
         f"Tile generation complete. Processed {processed_files} files, skipped {skipped_files} files."
@@ -127,8 +191,77 @@ def generate_tiles_from_geojson(
     return True
 
 
+def _tile_one_geojson(file, output_dir, min_zoom, max_zoom, threads):
+    """Run tippecanoe (and mb-util) for one GeoJSON file. Returns a status."""
+    try:
+        # Extract base name for the output
+        base_name = file.stem
+        mbtiles_output = output_dir / f"{base_name}.mbtiles"
+        extract_dir = output_dir / base_name
+
+        # Build tippecanoe command
+        cmd = [
+            "tippecanoe",
+            "-o",
+            str(mbtiles_output),
+            "-zg",  # Automatically determine zoom levels based on data
+            "--drop-densest-as-needed",  # Drop some features at high zoom levels if too dense
+            "--extend-zooms-if-still-dropping",  # Extend zoom levels if needed
+            "--force",  # Overwrite existing files
+            str(file),
+        ]
+
+        # Add zoom level constraints if specified
+        if min_zoom is not None:
+            cmd.extend(["-Z", str(min_zoom)])
+        if max_zoom is not None:
+            cmd.extend(["-z", str(max_zoom)])
+
+        # Run tippecanoe, bounding its own thread usage so concurrent jobs
+        # don't oversubscribe the machine
+        env = dict(os.environ, TIPPECANOE_MAX_THREADS=str(threads))
+        print(f"Running: {' '.join(cmd)}")
+        _run_streaming(cmd, env=env)
+
+        # Extract tiles to directory if needed
+        if output_dir:
+            extract_dir.mkdir(parents=True, exist_ok=True)
+
+            # Use mb-util to extract tiles
+            extract_cmd = [
+                "mb-util",
+                "--image_format=pbf",
+                str(mbtiles_output),
+                str(extract_dir),
+            ]
+
+            try:
+                print(f"Extracting tiles: {' '.join(extract_cmd)}")
+                subprocess.run(extract_cmd, check=True, capture_output=True, text=True)
+            except (subprocess.SubprocessError, FileNotFoundError):
+                print(
+                    "Warning: mb-util not found. MBTiles file created but not extracted to directory structure."
+                )
+                print(
+                    "Install mb-util to extract tiles: npm install -g @mapbox/mbutil"
+                )
+
+        print(f"Successfully generated tiles for {file}")
+        return "processed"
+
+    except Exception as e:
+        print(f"Error generating tiles for {file}: {str(e)}")
+        return "error"
+
+
 def generate_tiles_from_geotiff(
-    geotiff_path, output_dir, min_zoom=0, max_zoom=14, force_regenerate=False
+    geotiff_path,
+    output_dir,
+    min_zoom=0,
+    max_zoom=14,
+    force_regenerate=False,
+    max_workers=None,
+    jobs=None,
 ):
     """
     Generate map tiles from GeoTIFF data using GDAL.
@@ -139,15 +272,16 @@ def generate_tiles_from_geotiff(
         min_zoom: Minimum zoom level (default: 0)
         max_zoom: Maximum zoom level (default: 14)
         force_regenerate: If True, regenerate tiles even if they already exist
+        max_workers: Number of gdal2tiles jobs to run concurrently
+            (default: the jobs budget divided by gdal2tiles' process usage)
+        jobs: Total CPU budget for tile generation (default: CPU count)
     """
     geotiff_path = Path(geotiff_path)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Check if gdal is installed
-    try:
-        subprocess.run(["gdalinfo", "--version"], check=True, capture_output=True)
-    except (subprocess.SubprocessError, FileNotFoundError):
+    if not _have_gdal():
         print("Error: GDAL is not installed or not in PATH.")
         print("Please install GDAL: https://gdal.org/download.html")
         return False
@@ -158,49 +292,56 @@ def generate_tiles_from_geotiff(
     else:
         files = list(geotiff_path.glob("*.tif"))
 
-    # Track processed and skipped files
-    processed_files = 0
-    skipped_files = 0
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if max_workers is None:
+        max_workers = _default_max_workers(jobs)
 
-    for file in tqdm(files, desc="Generating tiles from GeoTIFF"):
-        try:
-            # Extract base name for the output
-            base_name = file.stem
-            output_path = output_dir / base_name
-
-            # Check if output already exists
-            if (
-                output_path.exists()
-                and any(output_path.iterdir())
-                and not force_regenerate
-            ):
-                print(f"Skipping {file.name} - output already exists: {output_path}")
+    # Drop inputs whose tile directories already exist, using a single
+    # directory listing instead of per-file stat checks inside the loop
+    skipped_files = 0
+    if not force_regenerate:
+        existing = {
+            p.name for p in output_dir.iterdir() if p.is_dir() and any(p.iterdir())
+        }
+        remaining = []
+        for file in files:
+            if file.stem in existing:
+                print(
+                    f"Skipping {file.name} - output already exists: "
+                    f"{output_dir / file.stem}"
+                )
                 skipped_files += 1
-                continue
-
-            output_path.mkdir(parents=True, exist_ok=True)
-
-            # Build gdal2tiles command
-            cmd = [
-                "gdal2tiles.py",
-                "--zoom",
-                f"{min_zoom}-{max_zoom}",
-                "--webviewer=none",  # Don't generate HTML viewer
-                "--processes=4",  # Use multiple processes for faster generation
-                str(file),
-                str(output_path),
-            ]
-
-            # Run gdal2tiles
-            print(f"Running: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-
-            print(f"Successfully generated tiles for {file}")
-            processed_files += 1
+            else:
+                remaining.append(file)
+        files = remaining
+
+    # A lone job may use the whole budget; concurrent jobs share it
+    serial = len(files) <= 1 or max_workers == 1
+    processes_per_job = jobs if serial else max(1, jobs // max_workers)
+
+    tile_one = partial(
+        _tile_one_geotiff,
+        output_dir=output_dir,
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
+        processes=processes_per_job,
+    )
+    if serial:
+        results = [
+            tile_one(file) for file in tqdm(files, desc="Generating tiles from GeoTIFF")
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                tqdm(
+                    executor.map(tile_one, files),
+                    total=len(files),
+                    desc="Generating tiles from GeoTIFF",
+                )
+            )
 
-        except Exception as e:
-            print(f"Error generating tiles for {file}: {str(e)}")
-            continue
+    processed_files = results.count("processed")
 
     print(
         f"Tile generation complete. Processed {processed_files} files, skipped {skipped_files} files."
@@ -208,8 +349,40 @@ def generate_tiles_from_geotiff(
     return True
 
 
+def _tile_one_geotiff(file, output_dir, min_zoom, max_zoom, processes):
+    """Run gdal2tiles for one GeoTIFF file. Returns a status."""
+    try:
+        # Extract base name for the output
+        base_name = file.stem
+        output_path = output_dir / base_name
+
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        # Build gdal2tiles command
+        cmd = [
+            "gdal2tiles.py",
+            "--zoom",
+            f"{min_zoom}-{max_zoom}",
+            "--webviewer=none",  # Don't generate HTML viewer
+            f"--processes={processes}",  # Use multiple processes for faster generation
+            str(file),
+            str(output_path),
+        ]
+
+        # Run gdal2tiles
+        print(f"Running: {' '.join(cmd)}")
+        _run_streaming(cmd)
+
+        print(f"Successfully generated tiles for {file}")
+        return "processed"
+
+    except Exception as e:
+        print(f"Error generating tiles for {file}: {str(e)}")
+        return "error"
+
+
 def create_xyz_tiles(
-    tif_path, output_dir, min_zoom=0, max_zoom=14, force_regenerate=False
+    tif_path, output_dir, min_zoom=0, max_zoom=14, force_regenerate=False, jobs=None
 ):
     """
     Create XYZ tiles from GeoTIFF using GDAL API.
@@ -221,6 +394,7 @@ def create_xyz_tiles(
         min_zoom: Minimum zoom level (default: 0)
         max_zoom: Maximum zoom level (default: 14)
         force_regenerate: If True, regenerate tiles even if they already exist
+        jobs: Number of gdal2tiles processes (default: CPU count)
     """
     try:
         from osgeo import gdal
@@ -253,53 +427,44 @@ def create_xyz_tiles(
             print(f"Error: Could not open {tif_path}")
             return False
 
-        # Create VRT dataset
-        vrt_options = gdal.BuildVRTOptions(resampleAlg="near")
-        vrt_ds = gdal.BuildVRT("", [str(tif_path)], options=vrt_options)
-
-        # Create tiles
-        gdal.SetConfigOption("GDAL_TIFF_INTERNAL_MASK", "YES")
-
-        # Use gdal.Translate to create tiles
-        tile_options = gdal.TranslateOptions(
-            format="GTiff",
-            creationOptions=["TILED=YES", "COMPRESS=DEFLATE"],
-            outputType=gdal.GDT_Byte,
+        # Chain the Byte conversion and the Web Mercator reprojection as
+        # VRTs (tiny XML stubs); gdal2tiles reads through them, so the
+        # raster pixels are only rewritten once - into the tiles themselves -
+        # instead of twice into temporary GeoTIFFs
+        byte_vrt = region_dir / "byte.vrt"
+        gdal.Translate(
+            str(byte_vrt),
+            ds,
+            options=gdal.TranslateOptions(format="VRT", outputType=gdal.GDT_Byte),
         )
 
-        # Create temporary GeoTIFF file
-        temp_tif = region_dir / "temp.tif"
-        gdal.Translate(str(temp_tif), vrt_ds, options=tile_options)
-
-        # Use gdal.Warp to reproject to Web Mercator
-        warp_options = gdal.WarpOptions(
-            dstSRS="EPSG:3857",
-            resampleAlg="near",
-            multithread=True,
-            warpOptions=["NUM_THREADS=ALL_CPUS"],
-            creationOptions=["TILED=YES", "COMPRESS=DEFLATE"],
+        warped_vrt = region_dir / "warped.vrt"
+        gdal.Warp(
+            str(warped_vrt),
+            str(byte_vrt),
+            options=gdal.WarpOptions(
+                format="VRT", dstSRS="EPSG:3857", resampleAlg="near"
+            ),
         )
 
-        # Create reprojected GeoTIFF file
-        warped_tif = region_dir / "warped.tif"
-        gdal.Warp(str(warped_tif), str(temp_tif), options=warp_options)
-
         # Use gdal2tiles.py for tile generation (more efficient than manual approach)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
         cmd = [
             "gdal2tiles.py",
             "--zoom",
             f"{min_zoom}-{max_zoom}",
             "--webviewer=none",
-            "--processes=4",
-            str(warped_tif),
+            f"--processes={jobs}",
+            str(warped_vrt),
             str(region_dir),
         ]
 
-        subprocess.run(cmd, check=True)
+        _run_streaming(cmd)
 
-        # Clean up temporary files
-        os.remove(temp_tif)
-        os.remove(warped_tif)
+        # Clean up the VRT stubs
+        os.remove(warped_vrt)
+        os.remove(byte_vrt)
 
         print(f"Successfully created tiles in {region_dir}")
         return True
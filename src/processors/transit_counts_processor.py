@@ -7,23 +7,181 @@ Processes AISVesselTransitCounts data into time-series GeoJSON format suitable f
 """
 
 import os
+import re
 import json
 import geopandas as gpd
 import pandas as pd
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
 from rasterio.features import shapes
-from shapely.geometry import shape, mapping, Point
+from shapely.geometry import shape, mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from tqdm import tqdm
 
+# Prefer pyogrio for vector I/O: it reads/writes through GDAL's Arrow
+# interface in bulk instead of Fiona's feature-at-a-time Python loop.
+try:
+    import pyogrio  # noqa: F401
+
+    gpd.options.io_engine = "pyogrio"
+    _HAS_PYOGRIO = True
+except ImportError:
+    _HAS_PYOGRIO = False
+
+
+# Optional numba acceleration for the raster sampling kernel on very large
+# rasters; the NumPy path below is used when numba is not installed
+try:
+    from numba import njit, prange
+
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sample_nonzero(band, step, a, b, c, d, e, f):
+        """Subsample a band, keep non-zero cells and compute lon/lat.
+
+        Two passes over row blocks: count non-zero samples per row to get
+        stable output offsets, then fill the lon/lat/value arrays in
+        parallel without any synchronization.
+        """
+        height, width = band.shape
+        n_rows = (height + step - 1) // step
+
+        counts = np.zeros(n_rows, dtype=np.int64)
+        for i in prange(n_rows):
+            y = i * step
+            n = 0
+            for x in range(0, width, step):
+                if band[y, x] > 0:
+                    n += 1
+            counts[i] = n
+
+        offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        for i in range(n_rows):
+            offsets[i + 1] = offsets[i] + counts[i]
+        total = offsets[n_rows]
+
+        lon = np.empty(total, dtype=np.float64)
+        lat = np.empty(total, dtype=np.float64)
+        values = np.empty(total, dtype=np.float64)
+        for i in prange(n_rows):
+            y = i * step
+            idx = offsets[i]
+            for x in range(0, width, step):
+                value = band[y, x]
+                if value > 0:
+                    lon[idx] = c + (x + 0.5) * a + (y + 0.5) * b
+                    lat[idx] = f + (x + 0.5) * d + (y + 0.5) * e
+                    values[idx] = value
+                    idx += 1
+        return lon, lat, values
+
+
+def _read_vector(file_path):
+    """Read a vector file, using pyogrio's Arrow interface when available."""
+    if _HAS_PYOGRIO:
+        return gpd.read_file(file_path, engine="pyogrio", use_arrow=True)
+    return gpd.read_file(file_path)
+
+
+# Manifest of processed inputs kept next to the outputs, so reruns can skip
+# unchanged files without opening them or stat'ing their outputs
+_MANIFEST_NAME = ".manifest.json"
+
+
+def _load_manifest(output_path):
+    """Load the manifest recording (size, mtime) of processed input files."""
+    try:
+        with open(output_path / _MANIFEST_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_path, manifest):
+    """Atomically replace the manifest next to the outputs."""
+    tmp_path = output_path / (_MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, output_path / _MANIFEST_NAME)
+
+
+def _manifest_key(file):
+    """Cheap change-detection key for an input file."""
+    stat = file.stat()
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+# Shapefiles at least this large are streamed in Arrow record batches
+# instead of being loaded into one GeoDataFrame
+_STREAM_THRESHOLD_BYTES = 1 << 30
+
+# Band dtypes the raster sampling path can read directly as float32
+_NUMERIC_DTYPES = {
+    "uint8",
+    "int8",
+    "uint16",
+    "int16",
+    "uint32",
+    "int32",
+    "float32",
+    "float64",
+}
+
+
+def _project_count_columns(gdf):
+    """Rename the count columns (one columnar pass) and drop the raw ones."""
+    for source_col, target_col in (
+        ("VesselCount", "vessel_count"),
+        ("TransitCount", "transit_count"),
+    ):
+        if source_col in gdf.columns:
+            # One columnar C-level coercion; tolerates missing/garbled values
+            # the way int(row.get(...)) never did
+            gdf[target_col] = (
+                pd.to_numeric(gdf[source_col], errors="coerce")
+                .fillna(0)
+                .astype("int32")
+            )
+        else:
+            gdf[target_col] = 0
+    return gdf.drop(columns=["VesselCount", "TransitCount"], errors="ignore")
+
+
+def _output_format(use_flatgeobuf, newline_delimited=False):
+    """Pick the output suffix and OGR driver for the configured format."""
+    if use_flatgeobuf:
+        return ".fgb", "FlatGeobuf"
+    if newline_delimited:
+        return ".geojsonl", "GeoJSONSeq"
+    return ".geojson", "GeoJSON"
+
+
+def _write_vector(gdf, output_file, driver="GeoJSON"):
+    """Write a GeoDataFrame, using pyogrio when available."""
+    if _HAS_PYOGRIO:
+        gdf.to_file(output_file, driver=driver, engine="pyogrio")
+    else:
+        gdf.to_file(output_file, driver=driver)
+
 
 def process_transit_counts(
     input_path: str,
     output_path: str,
     time_field: str = "BaseDateTime",
     force_reprocess: bool = False,
+    max_workers: int = None,
+    use_flatgeobuf: bool = False,
+    newline_delimited: bool = False,
+    partition_by: str = "day",
 ):
     """
     Process AIS vessel transit counts data into time-series GeoJSON files.
@@ -33,6 +191,15 @@ def process_transit_counts(
         output_path: Path to output directory for processed GeoJSON files
         time_field: Field name containing timestamp information (for shapefiles)
         force_reprocess: If True, reprocess files even if output already exists
+        max_workers: Number of worker processes for directory inputs
+            (default: CPU count; 1 forces serial processing)
+        use_flatgeobuf: If True, write FlatGeobuf (.fgb) instead of GeoJSON;
+            FlatGeobuf parses much faster in tippecanoe and GDAL
+        newline_delimited: If True, write newline-delimited GeoJSON
+            (.geojsonl), which streams instead of buffering a whole
+            FeatureCollection and which tippecanoe ingests in parallel
+        partition_by: "day" (default) or "month"; monthly partitioning
+            coalesces long time ranges into far fewer output files
     """
     input_path = Path(input_path)
     output_path = Path(output_path)
@@ -47,66 +214,164 @@ def process_transit_counts(
         tif_files = list(input_path.glob("*.tif"))
         files = shp_files + tif_files
 
-    # Track processed and skipped files
-    processed_files = 0
-    skipped_files = 0
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
 
-    for file in tqdm(files, desc="Processing transit count files"):
-        try:
-            file_ext = file.suffix.lower()
-
-            # Check if this file has already been processed
-            if file_ext == ".shp":
-                # For shapefiles, we need to check if any output files exist with this file's name
-                date_str = extract_date_from_filename(file.stem)
-                if date_str:
-                    output_file = output_path / f"transit_counts_{date_str}.geojson"
-                    if output_file.exists() and not force_reprocess:
-                        print(
-                            f"Skipping {file.name} - output already exists: {output_file}"
-                        )
-                        skipped_files += 1
-                        continue
-            elif file_ext == ".tif":
-                # For GeoTIFF, check if output file exists
-                date_str = extract_date_from_filename(file.stem)
-                if date_str:
-                    output_file = (
-                        output_path / f"transit_counts_{date_str}_{file.stem}.geojson"
-                    )
-                    if output_file.exists() and not force_reprocess:
-                        print(
-                            f"Skipping {file.name} - output already exists: {output_file}"
-                        )
-                        skipped_files += 1
-                        continue
-
-            # Process the file based on its type
-            if file_ext == ".shp":
-                # Process shapefile
-                process_shapefile(file, output_path, time_field)
-            elif file_ext == ".tif":
-                # Process GeoTIFF
-                process_geotiff(file, output_path)
-            else:
-                print(f"Unsupported file format: {file}")
+    # List the output directory once and drop already-produced inputs up
+    # front, instead of stat'ing an output path per file inside the loop.
+    # The manifest additionally remembers inputs processed on earlier runs,
+    # keyed by size+mtime, so unchanged files skip without any output checks
+    manifest = _load_manifest(output_path)
+    skipped_files = 0
+    if not force_reprocess:
+        existing = {p.name for p in output_path.iterdir()}
+        remaining = []
+        for file in files:
+            if manifest.get(str(file)) == _manifest_key(file):
+                print(f"Skipping {file.name} - unchanged since last run")
+                skipped_files += 1
                 continue
-
-            processed_files += 1
-
-        except Exception as e:
-            print(f"Error processing file {file}: {str(e)}")
-            continue
+            output_name = _expected_output_name(file, use_flatgeobuf, newline_delimited)
+            if output_name is not None and output_name in existing:
+                print(
+                    f"Skipping {file.name} - output already exists: "
+                    f"{output_path / output_name}"
+                )
+                skipped_files += 1
+            else:
+                remaining.append(file)
+        files = remaining
+
+    # Files are independent, so process them in parallel worker processes
+    # when there is more than one; keep a serial path for single files and
+    # max_workers=1 (easier debugging, no fork overhead)
+    if len(files) <= 1 or max_workers == 1:
+        results = [
+            _process_one(
+                file,
+                output_path,
+                time_field,
+                use_flatgeobuf,
+                newline_delimited,
+                partition_by,
+            )
+            for file in tqdm(files, desc="Processing transit count files")
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _process_one,
+                    file,
+                    output_path,
+                    time_field,
+                    use_flatgeobuf,
+                    newline_delimited,
+                    partition_by,
+                )
+                for file in files
+            ]
+            results = [
+                future.result()
+                for future in tqdm(
+                    as_completed(futures),
+                    total=len(futures),
+                    desc="Processing transit count files",
+                )
+            ]
+
+    processed_files = sum(1 for status, _ in results if status == "processed")
+    skipped_files += sum(1 for status, _ in results if status == "skipped")
+
+    # Record successfully processed inputs for the next run
+    for status, file in results:
+        if status == "processed":
+            manifest[str(file)] = _manifest_key(file)
+    if results:
+        _save_manifest(output_path, manifest)
 
     print(
         f"Processing complete. Processed {processed_files} files, skipped {skipped_files} files. Output saved to {output_path}"
     )
 
 
-def process_shapefile(file_path, output_path, time_field):
-    """Process a shapefile into GeoJSON files grouped by date."""
+def _expected_output_name(file, use_flatgeobuf=False, newline_delimited=False):
+    """Output filename an input file would produce, or None if underivable."""
+    out_suffix, _ = _output_format(use_flatgeobuf, newline_delimited)
+    date_str = extract_date_from_filename(file.stem)
+    if not date_str:
+        return None
+    file_ext = file.suffix.lower()
+    if file_ext == ".shp":
+        return f"transit_counts_{date_str}{out_suffix}"
+    if file_ext == ".tif":
+        return f"transit_counts_{date_str}_{file.stem}{out_suffix}"
+    return None
+
+
+def _process_one(
+    file,
+    output_path,
+    time_field,
+    use_flatgeobuf=False,
+    newline_delimited=False,
+    partition_by="day",
+):
+    """Process a single transit counts file. Returns (status, file)."""
+    try:
+        file_ext = file.suffix.lower()
+
+        # Process the file based on its type
+        if file_ext == ".shp":
+            # Process shapefile
+            process_shapefile(
+                file,
+                output_path,
+                time_field,
+                use_flatgeobuf,
+                newline_delimited,
+                partition_by,
+            )
+        elif file_ext == ".tif":
+            # Process GeoTIFF
+            process_geotiff(file, output_path, use_flatgeobuf, newline_delimited)
+        else:
+            print(f"Unsupported file format: {file}")
+            return ("skipped", file)
+
+        return ("processed", file)
+
+    except Exception as e:
+        print(f"Error processing file {file}: {str(e)}")
+        return ("error", file)
+
+
+def process_shapefile(
+    file_path,
+    output_path,
+    time_field,
+    use_flatgeobuf=False,
+    newline_delimited=False,
+    partition_by="day",
+):
+    """Process a shapefile into GeoJSON/FlatGeobuf files grouped by date."""
+    out_suffix, driver = _output_format(use_flatgeobuf, newline_delimited)
+    period_unit = "M" if partition_by == "month" else "D"
+
+    # Stream very large shapefiles in Arrow record batches so the whole
+    # dataset never sits in memory; needs an append-capable output driver
+    if (
+        _HAS_PYOGRIO
+        and driver in ("FlatGeobuf", "GeoJSONSeq")
+        and file_path.stat().st_size >= _STREAM_THRESHOLD_BYTES
+    ):
+        _process_shapefile_streaming(
+            file_path, output_path, time_field, out_suffix, driver, period_unit
+        )
+        return
+
     # Read the shapefile
-    gdf = gpd.read_file(file_path)
+    gdf = _read_vector(file_path)
 
     # Ensure the time field exists
     if time_field not in gdf.columns:
@@ -114,7 +379,7 @@ def process_shapefile(file_path, output_path, time_field):
         date_str = extract_date_from_filename(file_path.stem)
         if date_str:
             # Create a single output file with the extracted date
-            output_file = output_path / f"transit_counts_{date_str}.geojson"
+            output_file = output_path / f"transit_counts_{date_str}{out_suffix}"
 
             # Ensure the CRS is WGS84 (EPSG:4326)
             if gdf.crs is not None and gdf.crs != "EPSG:4326":
@@ -123,7 +388,7 @@ def process_shapefile(file_path, output_path, time_field):
                 print(f"Warning: CRS not defined for {file_path}. Assuming WGS84.")
                 gdf.set_crs("EPSG:4326", inplace=True)
 
-            gdf.to_file(output_file, driver="GeoJSON")
+            _write_vector(gdf, output_file, driver)
             return
         else:
             raise ValueError(
@@ -140,47 +405,125 @@ def process_shapefile(file_path, output_path, time_field):
         print(f"Warning: CRS not defined for {file_path}. Assuming WGS84.")
         gdf.set_crs("EPSG:4326", inplace=True)
 
-    # Group by time periods (e.g., by day)
-    grouped = gdf.groupby(gdf[time_field].dt.strftime("%Y-%m-%d"))
+    # Project the property columns once for the whole frame instead of per
+    # date group: rename the count columns and drop the raw ones up front
+    gdf = _project_count_columns(gdf)
+
+    # Group by time period (daily or monthly). Truncating to datetime64 is
+    # one C pass over the int64 buffer, unlike strftime which formats a
+    # Python string per row; sort=False skips an unneeded sort of the groups
+    period_keys = gdf[time_field].values.astype(f"datetime64[{period_unit}]")
+    grouped = gdf.groupby(period_keys, sort=False)
+
+    # List the output directory once to skip already-produced date groups
+    existing = {p.name for p in output_path.iterdir()}
 
     # Process each time period
-    for date, group in grouped:
+    for period, group in grouped:
+        # Format the date string once per group, not once per row. pandas
+        # hands back Timestamp keys, so truncate to the partition unit
+        # before formatting (datetime_as_string rejects Timestamps)
+        date = np.datetime_as_string(
+            np.datetime64(period, period_unit), unit=period_unit
+        )
+
         # Create output filename
-        output_file = output_path / f"transit_counts_{date}.geojson"
+        output_file = output_path / f"transit_counts_{date}{out_suffix}"
 
         # Skip if file already exists (handled at the higher level)
-        if output_file.exists():
+        if output_file.name in existing:
             continue
 
-        # Convert to GeoJSON format with additional properties
-        geojson_data = {"type": "FeatureCollection", "features": []}
-
-        for _, row in group.iterrows():
-            feature = {
-                "type": "Feature",
-                "geometry": json.loads(row.geometry.to_json()),
-                "properties": {
-                    "date": date,
-                    "vessel_count": int(row.get("VesselCount", 0)),
-                    "transit_count": int(row.get("TransitCount", 0)),
-                    # Add any other relevant properties
-                    **{
-                        k: v
-                        for k, v in row.items()
-                        if k
-                        not in ["geometry", time_field, "VesselCount", "TransitCount"]
-                    },
-                },
-            }
-            geojson_data["features"].append(feature)
+        # Only the date column is group-specific; everything else was
+        # prepared above, so the vector driver gets the group in one call
+        group = group.drop(columns=[time_field])
+        group["date"] = date
 
         # Save to file
-        with open(output_file, "w") as f:
-            json.dump(geojson_data, f)
+        _write_vector(group, output_file, driver)
 
 
-def process_geotiff(file_path, output_path):
-    """Process a GeoTIFF file into GeoJSON format."""
+def _process_shapefile_streaming(
+    file_path, output_path, time_field, out_suffix, driver, period_unit="D"
+):
+    """Stream a shapefile in Arrow record batches, appending per-date outputs.
+
+    Memory stays at O(batch) instead of O(file): each record batch is turned
+    into a small GeoDataFrame, split by day and appended to that day's
+    output file.
+    """
+    from shapely import from_wkb
+
+    existing = {p.name for p in output_path.iterdir()}
+    appended = set()  # dates whose output file was started during this run
+
+    with pyogrio.open_arrow(file_path, use_pyarrow=True) as (meta, reader):
+        geometry_name = meta.get("geometry_name") or "wkb_geometry"
+        for batch in reader:
+            df = batch.to_pandas()
+
+            gdf = gpd.GeoDataFrame(
+                df.drop(columns=[geometry_name]),
+                geometry=from_wkb(df[geometry_name]),
+                crs=meta.get("crs"),
+            )
+
+            # Ensure the CRS is WGS84 (EPSG:4326)
+            if gdf.crs is not None and gdf.crs != "EPSG:4326":
+                gdf = gdf.to_crs("EPSG:4326")
+            elif gdf.crs is None:
+                print(f"Warning: CRS not defined for {file_path}. Assuming WGS84.")
+                gdf.set_crs("EPSG:4326", inplace=True)
+
+            if time_field not in gdf.columns:
+                # Same fallback as the non-streaming path: the whole file
+                # maps to one output named after the filename date, appended
+                # to batch by batch
+                date_str = extract_date_from_filename(file_path.stem)
+                if not date_str:
+                    raise ValueError(
+                        f"Time field '{time_field}' not found in the data and couldn't extract date from filename"
+                    )
+                output_file = output_path / f"transit_counts_{date_str}{out_suffix}"
+                if date_str not in appended and output_file.name in existing:
+                    return
+                pyogrio.write_dataframe(
+                    gdf, output_file, driver=driver, append=date_str in appended
+                )
+                appended.add(date_str)
+                continue
+
+            gdf[time_field] = pd.to_datetime(gdf[time_field])
+            gdf = _project_count_columns(gdf)
+
+            period_keys = gdf[time_field].values.astype(f"datetime64[{period_unit}]")
+            for period, group in gdf.groupby(period_keys, sort=False):
+                # groupby yields Timestamp keys; truncate back to the
+                # partition unit before formatting
+                date = np.datetime_as_string(
+                    np.datetime64(period, period_unit), unit=period_unit
+                )
+                output_file = output_path / f"transit_counts_{date}{out_suffix}"
+
+                # Skip leftovers from previous runs, but keep appending to
+                # files this run has already started
+                if date not in appended and output_file.name in existing:
+                    continue
+
+                group = group.drop(columns=[time_field])
+                group["date"] = date
+                pyogrio.write_dataframe(
+                    group, output_file, driver=driver, append=date in appended
+                )
+                appended.add(date)
+
+
+def process_geotiff(
+    file_path, output_path, use_flatgeobuf=False, newline_delimited=False
+):
+    """Process a GeoTIFF file into GeoJSON/FlatGeobuf format."""
+    out_suffix, driver = _output_format(use_flatgeobuf, newline_delimited)
+
     # Extract date from filename
     date_str = extract_date_from_filename(file_path.stem)
     if not date_str:
@@ -188,71 +531,94 @@ def process_geotiff(file_path, output_path):
         date_str = datetime.now().strftime("%Y")
 
     # Create output filename
-    output_file = output_path / f"transit_counts_{date_str}_{file_path.stem}.geojson"
+    output_file = output_path / f"transit_counts_{date_str}_{file_path.stem}{out_suffix}"
 
     # Skip if file already exists (handled at the higher level)
     if output_file.exists():
         return
 
-    try:
-        # Read the GeoTIFF file metadata
-        with rasterio.open(file_path) as src:
-            # Get the transform and dimensions
-            transform = src.transform
-            width = src.width
-            height = src.height
-            crs = src.crs
-
-            # Create a grid of points for sampling
-            # Use a reduced resolution to keep file size manageable
-            step = 10  # Sample every 10th pixel
-            points = []
-            values = []
-
-            # Read the data in a more compatible way
-            band = src.read(1, out_dtype="float32")  # Force float32 dtype
-
-            # Sample the raster at regular intervals
-            for y in range(0, height, step):
-                for x in range(0, width, step):
-                    value = band[y, x]
-                    if value > 0:  # Only include non-zero values
-                        # Convert pixel coordinates to geographic coordinates
-                        lon, lat = rasterio.transform.xy(transform, y, x)
-                        points.append(Point(lon, lat))
-                        values.append(float(value))
-
-            # Create a GeoDataFrame
-            gdf = gpd.GeoDataFrame(
-                {
-                    "geometry": points,
-                    "value": values,
-                    "date": date_str,
-                    "source_file": file_path.name,
-                }
+    # Read the GeoTIFF file metadata
+    with rasterio.open(file_path) as src:
+        # Validate the raster up front instead of catching arbitrary
+        # failures later: the gdal_translate fallback re-reads the whole
+        # file from disk, so it should only run for rasters the sampling
+        # path genuinely cannot handle
+        if src.count < 1 or src.dtypes[0] not in _NUMERIC_DTYPES:
+            print(
+                f"Unsupported raster layout for {file_path} "
+                f"(bands={src.count}, dtypes={src.dtypes}); "
+                "falling back to point-cloud conversion"
             )
+            convert_tiff_to_point_cloud(file_path, output_file, date_str)
+            return
 
-            # Set the CRS to match the source GeoTIFF
-            if crs:
-                gdf.set_crs(crs, inplace=True)
-                # Convert to WGS84 (EPSG:4326) for Mapbox compatibility
-                gdf = gdf.to_crs("EPSG:4326")
-            else:
-                print(f"Warning: CRS not defined for {file_path}. Assuming WGS84.")
-                gdf.set_crs("EPSG:4326", inplace=True)
-
-            # Save to GeoJSON
-            gdf.to_file(output_file, driver="GeoJSON")
+        crs = src.crs
+
+        # Sample at a reduced resolution to keep file size manageable
+        step = 10  # Sample every 10th pixel
+
+        # Let GDAL decimate in-driver instead of reading the full raster
+        # into memory and slicing afterwards; peak memory drops by
+        # ~step^2 and only the reduced band is ever materialized.
+        # Nearest matches the original every-Nth-pixel sampling: averaging
+        # would truncate isolated counts to 0 in the source integer dtype
+        # and rescale the surviving values
+        band = src.read(
+            1,
+            out_shape=(max(1, src.height // step), max(1, src.width // step)),
+            resampling=Resampling.nearest,
+            out_dtype="float32",
+        )
+
+        # Affine transform of the decimated grid
+        transform = src.transform * rasterio.Affine.scale(
+            src.width / band.shape[1], src.height / band.shape[0]
+        )
+
+        # Keep the non-zero values of the reduced band. The numba kernel
+        # splits the work over row blocks; the NumPy fallback does the
+        # same with whole-array operations
+        if _HAS_NUMBA:
+            lon, lat, values = _sample_nonzero(
+                band,
+                1,
+                transform.a,
+                transform.b,
+                transform.c,
+                transform.d,
+                transform.e,
+                transform.f,
+            )
+        else:
+            rows, cols = np.nonzero(band > 0)
+            values = band[rows, cols].astype(float)
+
+            # Convert pixel-center coordinates to geographic coordinates
+            # by broadcasting the affine transform over the index arrays
+            lon = transform.c + (cols + 0.5) * transform.a + (rows + 0.5) * transform.b
+            lat = transform.f + (cols + 0.5) * transform.d + (rows + 0.5) * transform.e
+
+        # Create a GeoDataFrame
+        gdf = gpd.GeoDataFrame(
+            {
+                "value": values,
+                "date": date_str,
+                "source_file": file_path.name,
+            },
+            geometry=gpd.points_from_xy(lon, lat),
+        )
+
+        # Set the CRS to match the source GeoTIFF
+        if crs:
+            gdf.set_crs(crs, inplace=True)
+            # Convert to WGS84 (EPSG:4326) for Mapbox compatibility
+            gdf = gdf.to_crs("EPSG:4326")
+        else:
+            print(f"Warning: CRS not defined for {file_path}. Assuming WGS84.")
+            gdf.set_crs("EPSG:4326", inplace=True)
 
-    except Exception as e:
-        print(f"Error processing GeoTIFF {file_path}: {str(e)}")
-        # Try alternative method if the first one fails
-        try:
-            # Alternative method: convert to point cloud
-            convert_tiff_to_point_cloud(file_path, output_file, date_str)
-        except Exception as e2:
-            print(f"Alternative method also failed: {str(e2)}")
-            raise
+        # Save to GeoJSON/FlatGeobuf
+        _write_vector(gdf, output_file, driver)
 
 
 def convert_tiff_to_point_cloud(file_path, output_file, date_str):
@@ -278,8 +644,9 @@ def convert_tiff_to_point_cloud(file_path, output_file, date_str):
 
         # Convert to GeoJSON
         if "X" in df.columns and "Y" in df.columns:
-            # Create points from X and Y columns
-            geometry = [Point(xy) for xy in zip(df["X"], df["Y"])]
+            # Create points from the X and Y columns in one C-level pass
+            # instead of allocating a Point per row in Python
+            geometry = gpd.points_from_xy(df["X"].to_numpy(), df["Y"].to_numpy())
 
             # Create GeoDataFrame
             gdf = gpd.GeoDataFrame(
@@ -293,7 +660,7 @@ def convert_tiff_to_point_cloud(file_path, output_file, date_str):
             gdf["source_file"] = file_path.name
 
             # Save to GeoJSON
-            gdf.to_file(output_file, driver="GeoJSON")
+            _write_vector(gdf, output_file)
         else:
             raise ValueError("CSV file does not contain X and Y columns")
 
@@ -303,12 +670,14 @@ def convert_tiff_to_point_cloud(file_path, output_file, date_str):
             os.unlink(temp_csv_path)
 
 
+# Year pattern used to derive a date from filenames (e.g. 2023 in AISVTC2023Atlantic)
+_DATE_RE = re.compile(r"(\d{4})")
+
+
+@lru_cache(maxsize=4096)
 def extract_date_from_filename(filename):
     """Extract date information from filename."""
-    # Try to find year in the filename (e.g., 2023 in AISVTC2023Atlantic)
-    import re
-
-    year_match = re.search(r"(\d{4})", filename)
+    year_match = _DATE_RE.search(filename)
     if year_match:
         return year_match.group(1)
     return None
@@ -6,20 +6,110 @@ Vessel Tracks Processor
 Processes AISVesselTracks data into time-series GeoJSON format suitable for Mapbox visualization.
 """
 
+import logging
 import os
-import json
+import re
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyproj
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime, timedelta
 from tqdm import tqdm
 
+# Prefer pyogrio for vector I/O: it reads through GDAL's Arrow interface in
+# bulk instead of Fiona's feature-at-a-time Python loop
+try:
+    import pyogrio  # noqa: F401
+
+    gpd.options.io_engine = "pyogrio"
+    _HAS_PYOGRIO = True
+except ImportError:
+    _HAS_PYOGRIO = False
+
+
+# Build the target CRS once: parsing "EPSG:4326" per file redoes the PROJ
+# database lookup every time, while a prebuilt CRS object is reused as-is
+WGS84 = pyproj.CRS.from_epsg(4326)
+
+# AIS attribute columns exported as feature properties, renamed for output
+_PROPERTY_RENAMES = {
+    "MMSI": "mmsi",
+    "VesselType": "vessel_type",
+    "VesselName": "vessel_name",
+    "Length": "length",
+    "Width": "width",
+    "Draft": "draft",
+    "SOG": "speed",  # Speed Over Ground
+    "COG": "course",  # Course Over Ground
+}
+
+# Properties that default to an empty string when the column is missing;
+# the remaining renamed properties default to 0
+_STRING_PROPERTIES = ("vessel_type", "vessel_name")
+
+# Attribute columns the processor actually consumes. AIS shapefiles often
+# carry 15-25 DBF columns; restricting the read to these cuts parse time
+# and memory roughly in proportion
+_NEEDED_COLUMNS = tuple(_PROPERTY_RENAMES)
+
+# Compiled once at import time instead of per extract_date_from_filename call
+_YEAR_RE = re.compile(r"(\d{4})")
+
+# Threads for overlapping per-day output writes within one file; GDAL
+# releases the GIL while serializing, so a small pool scales without
+# oversubscribing the disk
+_WRITE_THREADS = 4
+
+# Per-file messages go through logging rather than print: workers write to
+# their own stderr buffers instead of taking turns on the stdout lock, and
+# the tqdm progress bar stays intact
+logger = logging.getLogger(__name__)
+
+
+def _ensure_wgs84(gdf, filename):
+    """Return ``gdf`` in WGS84 (EPSG:4326), assuming WGS84 when CRS is unset.
+
+    CRS.equals hits pyproj's cached comparison, so files already in WGS84
+    skip transformer construction entirely.
+    """
+    if gdf.crs is None:
+        logger.warning("CRS not defined for %s. Assuming WGS84.", filename)
+        gdf.set_crs(WGS84, inplace=True)
+        return gdf
+    return gdf if gdf.crs.equals(WGS84) else gdf.to_crs(WGS84)
+
+
+def _read_vector(file_path, columns=None):
+    """Read a vector file, using pyogrio's Arrow interface when available.
+
+    ``columns`` limits the attribute columns read (pyogrio only; columns
+    absent from the file are ignored). ``None`` reads everything.
+    """
+    if _HAS_PYOGRIO:
+        return gpd.read_file(
+            file_path, engine="pyogrio", columns=columns, use_arrow=True
+        )
+    return gpd.read_file(file_path)
+
+
+def _write_vector(gdf, output_file, driver="GeoJSON"):
+    """Write a GeoDataFrame, using pyogrio when available."""
+    if _HAS_PYOGRIO:
+        gdf.to_file(output_file, driver=driver, engine="pyogrio")
+    else:
+        gdf.to_file(output_file, driver=driver)
+
 
 def process_vessel_tracks(
     input_path: str,
     output_path: str,
     time_field: str = "TIMESTAMP",
     force_reprocess: bool = False,
+    max_workers: int = None,
+    newline_delimited: bool = False,
 ):
     """
     Process AIS vessel tracks data into time-series GeoJSON files.
@@ -29,137 +119,212 @@ def process_vessel_tracks(
         output_path: Path to output directory for processed GeoJSON files
         time_field: Field name containing timestamp information
         force_reprocess: If True, reprocess files even if output already exists
+        max_workers: Number of worker processes for directory inputs
+            (default: CPU count; 1 forces serial processing)
+        newline_delimited: If True, write newline-delimited GeoJSON (.geojsonl)
+            instead of FeatureCollection files; downstream tools like
+            tippecanoe can stream and split these in parallel
     """
     input_path = Path(input_path)
     output_path = Path(output_path)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Handle both single file and directory inputs
+    # Handle both single file and directory inputs. os.scandir enumerates
+    # the directory in one readdir pass using cached dirent type info,
+    # where glob stats every entry — noticeable on very large directories
     if input_path.is_file():
         files = [input_path]
     else:
-        files = list(input_path.glob("*.shp"))
-
-    # Track processed and skipped files
-    processed_files = 0
-    skipped_files = 0
-
-    for file in tqdm(files, desc="Processing vessel track files"):
-        try:
-            # Read the shapefile
-            gdf = gpd.read_file(file)
-
-            # Ensure the time field exists
-            if time_field not in gdf.columns:
-                # Try to extract date from filename
-                date_str = extract_date_from_filename(file.stem)
-                if date_str:
-                    # Check if output file exists
-                    output_file = output_path / f"vessel_tracks_{date_str}.geojson"
-                    if output_file.exists() and not force_reprocess:
-                        print(
-                            f"Skipping {file.name} - output already exists: {output_file}"
-                        )
-                        skipped_files += 1
-                        continue
-
-                    # Ensure the CRS is WGS84 (EPSG:4326)
-                    if gdf.crs is not None and gdf.crs != "EPSG:4326":
-                        gdf = gdf.to_crs("EPSG:4326")
-                    elif gdf.crs is None:
-                        print(f"Warning: CRS not defined for {file}. Assuming WGS84.")
-                        gdf.set_crs("EPSG:4326", inplace=True)
-
-                    # Save to file
-                    gdf.to_file(output_file, driver="GeoJSON")
-                    processed_files += 1
-                    continue
-                else:
-                    raise ValueError(
-                        f"Time field '{time_field}' not found in the data and couldn't extract date from filename"
-                    )
+        files = [
+            Path(entry.path)
+            for entry in os.scandir(input_path)
+            if entry.name.endswith(".shp") and entry.is_file(follow_symlinks=False)
+        ]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Every input file writes its own set of daily outputs, so files can be
+    # processed in parallel worker processes; keep a serial path for single
+    # files and max_workers=1 (easier debugging, no fork overhead)
+    worker = partial(
+        _process_one,
+        output_path=output_path,
+        time_field=time_field,
+        force_reprocess=force_reprocess,
+        newline_delimited=newline_delimited,
+    )
+    if len(files) <= 1 or max_workers == 1:
+        results = [
+            worker(file) for file in tqdm(files, desc="Processing vessel track files")
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                tqdm(
+                    executor.map(worker, files),
+                    total=len(files),
+                    desc="Processing vessel track files",
+                )
+            )
+
+    processed_files = sum(processed for processed, _ in results)
+    skipped_files = sum(skipped for _, skipped in results)
+
+    print(
+        f"Processing complete. Processed {processed_files} files, skipped {skipped_files} files. Output saved to {output_path}"
+    )
+
+
+def _process_one(file, output_path, time_field, force_reprocess, newline_delimited):
+    """Process one vessel tracks shapefile. Returns (processed, skipped) counts."""
+    processed = 0
+    skipped = 0
+    out_suffix, driver = (
+        (".geojsonl", "GeoJSONSeq") if newline_delimited else (".geojson", "GeoJSON")
+    )
+    try:
+        # Check for filename-derived output before reading anything: when the
+        # whole file maps to one output and that output already exists, the
+        # (expensive) shapefile read can be skipped entirely
+        date_str = extract_date_from_filename(file.stem)
+        if date_str:
+            output_file = output_path / f"vessel_tracks_{date_str}{out_suffix}"
+            if output_file.exists() and not force_reprocess:
+                logger.info(
+                    "Skipping %s - output already exists: %s", file.name, output_file
+                )
+                return (0, 1)
+
+        # Read the shapefile, pruned to the columns the processor consumes
+        gdf = _read_vector(file, columns=[*_NEEDED_COLUMNS, time_field])
+
+        # Ensure the time field exists
+        if time_field not in gdf.columns:
+            # Fall back to the date extracted from the filename
+            if date_str:
+                output_file = output_path / f"vessel_tracks_{date_str}{out_suffix}"
+
+                # Ensure the CRS is WGS84 (EPSG:4326)
+                gdf = _ensure_wgs84(gdf, file)
 
-            # Convert time field to datetime if it's not already
-            gdf[time_field] = pd.to_datetime(gdf[time_field])
+                # Save to file
+                _write_vector(gdf, output_file, driver=driver)
+                return (1, 0)
+            else:
+                raise ValueError(
+                    f"Time field '{time_field}' not found in the data and couldn't extract date from filename"
+                )
+
+        # Convert time field to datetime if it's not already
+        gdf[time_field] = pd.to_datetime(gdf[time_field])
+
+        # Ensure the CRS is WGS84 (EPSG:4326)
+        gdf = _ensure_wgs84(gdf, file)
+
+        # Prepare the property columns once per file rather than per day
+        # group: the renames, ISO timestamp formatting, and missing-column
+        # defaults are identical for every group, so repeating them inside
+        # the loop only reformats the same rows
+        gdf["timestamp"] = gdf[time_field].dt.strftime("%Y-%m-%dT%H:%M:%S")
+        gdf = gdf.rename(
+            columns={k: v for k, v in _PROPERTY_RENAMES.items() if k in gdf.columns}
+        )
 
-            # Ensure the CRS is WGS84 (EPSG:4326)
-            if gdf.crs is not None and gdf.crs != "EPSG:4326":
-                gdf = gdf.to_crs("EPSG:4326")
-            elif gdf.crs is None:
-                print(f"Warning: CRS not defined for {file}. Assuming WGS84.")
-                gdf.set_crs("EPSG:4326", inplace=True)
+        # Coerce property columns in bulk, keeping the output schema stable
+        # when source columns are missing: numeric properties become compact
+        # float32 arrays and string properties plain str, so the writer is
+        # not left sniffing mixed object dtypes row by row
+        for target_col in _PROPERTY_RENAMES.values():
+            if target_col == "mmsi":
+                # MMSI is a 9-decimal-digit identifier, so it fits a nullable
+                # UInt32 exactly — half the width of float64, and no precision
+                # loss the way a float cast would risk
+                if target_col in gdf.columns:
+                    gdf[target_col] = (
+                        pd.to_numeric(gdf[target_col], errors="coerce")
+                        .fillna(0)
+                        .astype("UInt32")
+                    )
+                else:
+                    gdf[target_col] = pd.array([0] * len(gdf), dtype="UInt32")
+            elif target_col in _STRING_PROPERTIES:
+                if target_col in gdf.columns:
+                    gdf[target_col] = gdf[target_col].fillna("").astype(str)
+                else:
+                    gdf[target_col] = ""
+            elif target_col in gdf.columns:
+                gdf[target_col] = (
+                    pd.to_numeric(gdf[target_col], errors="coerce")
+                    .fillna(0)
+                    .astype("float32")
+                )
+            else:
+                gdf[target_col] = np.float32(0)
 
-            # Group by time periods (e.g., by day)
-            grouped = gdf.groupby(gdf[time_field].dt.strftime("%Y-%m-%d"))
+        # Group by day using datetime64[D] keys: truncating the timestamp
+        # array is a cheap integer operation, unlike strftime which formats
+        # every row through Python; sort=False skips an unneeded key sort
+        day_keys = gdf[time_field].values.astype("datetime64[D]")
+        grouped = gdf.groupby(day_keys, sort=False)
+
+        # Process each time period. Day outputs are independent files, so
+        # the writes go through a small thread pool: GDAL releases the GIL
+        # while serializing, letting one day's output hit disk while the
+        # next group is prepared
+        write_futures = []
+        with ThreadPoolExecutor(max_workers=_WRITE_THREADS) as write_pool:
+            for day, group in grouped:
+                # pandas hands back Timestamp keys, which datetime_as_string
+                # rejects; truncate back to datetime64[D] before formatting
+                date = np.datetime_as_string(np.datetime64(day, "D"), unit="D")
 
-            # Process each time period
-            for date, group in grouped:
                 # Create output filename
-                output_file = output_path / f"vessel_tracks_{date}.geojson"
+                output_file = output_path / f"vessel_tracks_{date}{out_suffix}"
 
                 # Skip if file already exists and not forcing reprocess
                 if output_file.exists() and not force_reprocess:
-                    print(
-                        f"Skipping {date} from {file.name} - output already exists: {output_file}"
+                    logger.info(
+                        "Skipping %s from %s - output already exists: %s",
+                        date,
+                        file.name,
+                        output_file,
                     )
-                    skipped_files += 1
+                    skipped += 1
                     continue
 
-                # Convert to GeoJSON format with additional properties
-                geojson_data = {"type": "FeatureCollection", "features": []}
-
-                for _, row in group.iterrows():
-                    # Extract vessel information
-                    vessel_info = {
-                        "mmsi": str(row.get("MMSI", "")),
-                        "vessel_type": str(row.get("VesselType", "")),
-                        "vessel_name": str(row.get("VesselName", "")),
-                        "length": float(row.get("Length", 0)),
-                        "width": float(row.get("Width", 0)),
-                        "draft": float(row.get("Draft", 0)),
-                        "speed": float(row.get("SOG", 0)),  # Speed Over Ground
-                        "course": float(row.get("COG", 0)),  # Course Over Ground
-                    }
-
-                    feature = {
-                        "type": "Feature",
-                        "geometry": json.loads(row.geometry.to_json()),
-                        "properties": {
-                            "date": date,
-                            "timestamp": row[time_field].isoformat(),
-                            **vessel_info,
-                            # Add any other relevant properties
-                            **{
-                                k: v
-                                for k, v in row.items()
-                                if k
-                                not in ["geometry", time_field, *vessel_info.keys()]
-                            },
-                        },
-                    }
-                    geojson_data["features"].append(feature)
+                # Per group, only the date label differs; the driver
+                # serializes the whole group in one call. groupby slices are
+                # strided views carrying the parent's index —
+                # reset_index(drop=True) materializes compact contiguous
+                # columns (and replaces the plain copy), so the write streams
+                # cache-friendly buffers
+                group = group.reset_index(drop=True)
+                group["date"] = date
+                group = group.drop(columns=[time_field])
 
                 # Save to file
-                with open(output_file, "w") as f:
-                    json.dump(geojson_data, f)
+                write_futures.append(
+                    write_pool.submit(_write_vector, group, output_file, driver=driver)
+                )
 
-                processed_files += 1
+                processed += 1
 
-        except Exception as e:
-            print(f"Error processing file {file}: {str(e)}")
-            continue
+        # Surface write failures (the pool itself only waits, it does not
+        # re-raise)
+        for future in write_futures:
+            future.result()
 
-    print(
-        f"Processing complete. Processed {processed_files} files, skipped {skipped_files} files. Output saved to {output_path}"
-    )
+    except Exception as e:
+        logger.error("Error processing file %s: %s", file, e)
+
+    return (processed, skipped)
 
 
 def extract_date_from_filename(filename):
     """Extract date information from filename."""
     # Try to find year in the filename (e.g., 2023 in AISVesselTracks2023)
-    import re
-
-    year_match = re.search(r"(\d{4})", filename)
+    year_match = _YEAR_RE.search(filename)
     if year_match:
         return year_match.group(1)
     return None
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The processors live under src/ without a packaging setup, so make them
+# importable the same way main.py sees them
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
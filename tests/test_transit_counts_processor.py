@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Smoke tests for the transit counts processor."""
+
+import numpy as np
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+
+import pandas as pd
+from shapely.geometry import Point
+
+from processors import transit_counts_processor as tcp
+
+
+@pytest.fixture
+def counts_file(tmp_path):
+    """A small transit counts dataset spanning two days and two months.
+
+    Written as GeoPackage rather than ESRI shapefile: the shapefile driver
+    truncates field names to 10 characters, which would launder
+    BaseDateTime/VesselCount/TransitCount into unrecognizable names.
+    """
+    gdf = gpd.GeoDataFrame(
+        {
+            "BaseDateTime": [
+                "2023-01-01 00:00:00",
+                "2023-01-02 12:00:00",
+                "2023-02-01 06:00:00",
+            ],
+            "VesselCount": [1, 2, 3],
+            "TransitCount": [4, 5, 6],
+        },
+        geometry=[Point(0, 0), Point(1, 1), Point(2, 2)],
+        crs="EPSG:4326",
+    )
+    gpkg_path = tmp_path / "AISVTC2023.gpkg"
+    gdf.to_file(gpkg_path, driver="GPKG")
+    return gpkg_path
+
+
+def test_process_shapefile_writes_daily_outputs(counts_file, tmp_path):
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+
+    tcp.process_shapefile(counts_file, output_path, "BaseDateTime")
+
+    names = sorted(p.name for p in output_path.glob("*.geojson"))
+    assert names == [
+        "transit_counts_2023-01-01.geojson",
+        "transit_counts_2023-01-02.geojson",
+        "transit_counts_2023-02-01.geojson",
+    ]
+
+    written = gpd.read_file(output_path / "transit_counts_2023-01-01.geojson")
+    assert list(written["vessel_count"]) == [1]
+    assert list(written["transit_count"]) == [4]
+    # GDAL's GeoJSON reader sniffs the date string back as a datetime
+    assert list(written["date"]) == [pd.Timestamp("2023-01-01")]
+
+
+def test_process_shapefile_monthly_partition(counts_file, tmp_path):
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+
+    tcp.process_shapefile(
+        counts_file, output_path, "BaseDateTime", partition_by="month"
+    )
+
+    names = sorted(p.name for p in output_path.glob("*.geojson"))
+    assert names == [
+        "transit_counts_2023-01.geojson",
+        "transit_counts_2023-02.geojson",
+    ]
+
+    written = gpd.read_file(output_path / "transit_counts_2023-01.geojson")
+    assert len(written) == 2
+    # Compare via str in case the reader sniffs the month label as a date
+    assert {str(d) for d in written["date"]} == {"2023-01"}
+
+
+def test_process_geotiff_keeps_sparse_counts(tmp_path):
+    rasterio = pytest.importorskip("rasterio")
+    from rasterio.transform import from_origin
+
+    # Sparse integer count raster: two small clusters in an otherwise
+    # empty 50x50 grid, the shape AIS transit count GeoTIFFs actually have
+    band = np.zeros((50, 50), dtype="uint16")
+    band[0:10, 0:10] = 7
+    band[20:30, 30:40] = 3
+
+    tif_path = tmp_path / "AISVTC2023.tif"
+    with rasterio.open(
+        tif_path,
+        "w",
+        driver="GTiff",
+        height=50,
+        width=50,
+        count=1,
+        dtype="uint16",
+        crs="EPSG:4326",
+        transform=from_origin(-10.0, 10.0, 0.1, 0.1),
+    ) as dst:
+        dst.write(band, 1)
+
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+
+    tcp.process_geotiff(tif_path, output_path)
+
+    outputs = list(output_path.glob("*.geojson"))
+    assert len(outputs) == 1
+    written = gpd.read_file(outputs[0])
+
+    # Decimation must sample pixel values, not average them away: both
+    # clusters survive with their original counts
+    assert len(written) > 0
+    assert set(written["value"]) == {3.0, 7.0}
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Smoke tests for the vessel tracks processor."""
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+
+import pandas as pd
+from shapely.geometry import LineString
+
+from processors import vessel_tracks_processor as vtp
+
+
+def test_process_one_groups_by_day(tmp_path):
+    gdf = gpd.GeoDataFrame(
+        {
+            "TIMESTAMP": ["2023-01-01 03:00:00", "2023-01-02 04:30:00"],
+            "MMSI": ["123456789", "987654321"],
+            "SOG": [1.5, 2.5],
+        },
+        geometry=[LineString([(0, 0), (1, 1)]), LineString([(1, 1), (2, 2)])],
+        crs="EPSG:4326",
+    )
+    shp_path = tmp_path / "AISVesselTracks2023.shp"
+    gdf.to_file(shp_path)
+
+    output_path = tmp_path / "out"
+    output_path.mkdir()
+
+    processed, skipped = vtp._process_one(
+        shp_path,
+        output_path,
+        "TIMESTAMP",
+        force_reprocess=False,
+        newline_delimited=False,
+    )
+
+    assert (processed, skipped) == (2, 0)
+    names = sorted(p.name for p in output_path.glob("*.geojson"))
+    assert names == [
+        "vessel_tracks_2023-01-01.geojson",
+        "vessel_tracks_2023-01-02.geojson",
+    ]
+
+    written = gpd.read_file(output_path / "vessel_tracks_2023-01-01.geojson")
+    assert list(written["mmsi"]) == [123456789]
+    assert list(written["speed"]) == [1.5]
+    # GDAL's GeoJSON reader sniffs the ISO string back into a datetime
+    assert list(written["timestamp"]) == [pd.Timestamp("2023-01-01T03:00:00")]